@@ -1,9 +1,10 @@
 import json
 import os
+from functools import lru_cache
 
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
-from agents.action.tools import task_executor
+from agents.action.tools import ALL_STEPS_SUCCEEDED, close_mcp_session, task_executor
 from src.common.logger import get_logger
 
 logger = get_logger(__name__)
@@ -12,6 +13,15 @@ logger = get_logger(__name__)
 # Build a name -> callable lookup for the tools
 _TOOLS_BY_NAME = {task_executor.name: task_executor}
 
+_PROMPT_PATH = os.path.join(os.path.dirname(__file__), "prompt.md")
+
+
+@lru_cache(maxsize=None)
+def _system_message() -> SystemMessage:
+    """Load the instructions from prompt.md once; they are the same for every run."""
+    with open(_PROMPT_PATH, "r", encoding="utf-8") as f:
+        return SystemMessage(content=f.read())
+
 
 class ActionAgent:
     """Action Agent using Claude that can call the Playwright TaskExecutor tool to process UI flows."""
@@ -29,18 +39,17 @@ class ActionAgent:
             anthropic_api_key=api_key,
         ).bind_tools([task_executor])
 
+    async def close(self) -> None:
+        """Shut down the shared Playwright MCP session used by task_executor."""
+        await close_mcp_session()
+
     async def run(self, instruction: str, url: str) -> str:
         """
         Takes a natural language instruction and a URL, and runs an Agent loop.
         The Agent has access to the task_executor tool to control the Playwright browser.
         """
-        # Load instructions from prompt.md
-        prompt_path = os.path.join(os.path.dirname(__file__), "prompt.md")
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            system_prompt = f.read()
-
         messages = [
-            SystemMessage(content=system_prompt),
+            _system_message(),
             HumanMessage(content=f"Instruction: {instruction}\nTarget URL: {url}"),
         ]
 
@@ -58,6 +67,7 @@ class ActionAgent:
                     return response.content or "Agent completed without output."
 
                 # Execute each requested tool call and feed results back
+                tool_outputs = []
                 for tool_call in response.tool_calls:
                     tool_name = tool_call["name"]
                     tool_args = tool_call["args"]
@@ -71,6 +81,7 @@ class ActionAgent:
                         except Exception as tool_err:
                             tool_result = f"Tool error: {tool_err}"
 
+                    tool_outputs.append(str(tool_result))
                     messages.append(
                         ToolMessage(
                             content=str(tool_result),
@@ -78,6 +89,12 @@ class ActionAgent:
                         )
                     )
 
+                # A clean run needs no retry; return the executor's report verbatim
+                # rather than spending another LLM turn having the model restate it
+                if all(ALL_STEPS_SUCCEEDED in output for output in tool_outputs):
+                    print("[ActionAgent] Completed")
+                    return "\n\n".join(tool_outputs)
+
             # Exhausted iterations — return the last content we have
             print("[ActionAgent] WARNING: Max iterations reached")
             return response.content or "Agent reached maximum iterations without a final answer."
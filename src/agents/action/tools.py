@@ -2,7 +2,9 @@ import asyncio
 import base64
 import os
 import re
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Optional
 from langchain_core.tools import tool
@@ -15,6 +17,31 @@ from src.agents.scribe.types import StepRecord
 # Base directory for screenshots (src/agents/action/screenshots/)
 SCREENSHOTS_BASE_DIR = Path(__file__).parent / "screenshots"
 
+# Summary line task_executor ends with when every step went through; callers
+# can hand such a result back as-is instead of having the LLM restate it
+ALL_STEPS_SUCCEEDED = "Status: all steps succeeded"
+
+# Snapshot/step text patterns, compiled once at import
+_REF_RE = re.compile(r'\[ref=([\w\d]+)\]')  # [ref=s1e3]
+_LABEL_RE = re.compile(r'["\']([^"\']+)["\']')  # First quoted label on a line
+_TRAILING_MARKS_RE = re.compile(r'[\*\s]+$')  # Required-field "*" after a label
+_NON_WORD_RE = re.compile(r'[^\w\s]')  # Punctuation, replaced before keyword splits
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w\s-]')
+
+# Role/placeholder probes for snapshot lines. Each is a single C-level regex scan
+# instead of a Python any() loop over substrings; matching is still plain
+# substring containment, exactly as before.
+_TEXTBOX_ROLE_RE = re.compile("textbox|input|textarea|searchbox")
+_DROPDOWN_ROLE_RE = re.compile("combobox|listbox|select")
+_OPTION_ROLE_RE = re.compile("option|menuitem|listitem|treeitem")
+_PLACEHOLDER_RE = re.compile("select a|choose|--|placeholder")
+
+# Generic element names we want to avoid matching *only* on
+_GENERIC_TERMS = frozenset(
+    {"button", "input", "textbox", "textarea", "link", "checkbox", "radio", "select"}
+)
+
+
 # Module-level callback that the pipeline sets before invoking the tool.
 # This avoids changing the @tool signature (LangChain tools can't have extra params).
 _step_callback: Optional[Callable[[StepRecord], None]] = None
@@ -35,6 +62,108 @@ def _emit_step(record: StepRecord) -> None:
             pass  # Never let callback errors break execution
 
 
+# Shared Playwright MCP session. Spawning `npx @playwright/mcp` and attaching to
+# the browser costs far more than any single action, so the server is started
+# once per event loop and reused by every task_executor call on that loop.
+_MCP_SINGLETON: dict = {
+    "loop": None,
+    "lock": None,
+    "session": None,
+    "stop": None,
+    "task": None,
+}
+
+
+def _server_params() -> StdioServerParameters:
+    """Build the stdio parameters for the Playwright MCP server."""
+    # Connect to your existing open Chrome using the Playwright MCP Bridge extension!
+    # Make sure you have the extension installed in your Chrome browser.
+
+    # The environment variable is loaded by dotenv in run_action_agent.py.
+    # Pass it specifically in the env dictionary to the MCP server.
+    token = os.getenv("PLAYWRIGHT_MCP_EXTENSION_TOKEN")
+
+    return StdioServerParameters(
+        command="npx",
+        args=[
+            "@playwright/mcp@latest",
+            "--extension"
+        ],
+        env={"PLAYWRIGHT_MCP_EXTENSION_TOKEN": token} if token else {}
+    )
+
+
+async def _serve_mcp_session(ready: asyncio.Future, stop: asyncio.Event) -> None:
+    """
+    Own the MCP server for its whole lifetime.
+
+    The stdio client's task group must be exited by the task that entered it,
+    so the session lives in this background task until `stop` is set (or the
+    event loop cancels it on shutdown, which also terminates the server).
+    """
+    try:
+        async with stdio_client(_server_params()) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                print("[TaskExecutor] MCP session initialized")
+                ready.set_result(session)
+                await stop.wait()
+    except BaseException as e:
+        if not ready.done():
+            if isinstance(e, asyncio.CancelledError):
+                ready.cancel()
+            else:
+                ready.set_exception(e)
+        raise
+
+
+async def _get_mcp_session() -> ClientSession:
+    """Return the shared MCP session for the running loop, starting it on first use."""
+    loop = asyncio.get_running_loop()
+    if _MCP_SINGLETON["loop"] is not loop:
+        # Sessions (and locks) are bound to the loop that created them
+        _MCP_SINGLETON.update(
+            loop=loop, lock=asyncio.Lock(), session=None, stop=None, task=None
+        )
+
+    async with _MCP_SINGLETON["lock"]:
+        task = _MCP_SINGLETON["task"]
+        if _MCP_SINGLETON["session"] is None or task is None or task.done():
+            if task is not None and task.done():
+                # The previous server died mid-run; collect its outcome before
+                # replacing it so asyncio doesn't report it as unretrieved
+                await asyncio.gather(task, return_exceptions=True)
+            ready = loop.create_future()
+            stop = asyncio.Event()
+            task = loop.create_task(_serve_mcp_session(ready, stop))
+            _MCP_SINGLETON.update(session=None, stop=stop, task=task)
+            try:
+                _MCP_SINGLETON["session"] = await ready
+            except BaseException:
+                # Startup failed (or we were cancelled): tear the server task down
+                # and collect its outcome so asyncio doesn't report it as unretrieved
+                _MCP_SINGLETON.update(stop=None, task=None)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise
+        return _MCP_SINGLETON["session"]
+
+
+async def close_mcp_session() -> None:
+    """Shut down the shared MCP server, if one is running on the current loop."""
+    if _MCP_SINGLETON["loop"] is not asyncio.get_running_loop():
+        return
+
+    stop, task = _MCP_SINGLETON["stop"], _MCP_SINGLETON["task"]
+    _MCP_SINGLETON.update(session=None, stop=None, task=None)
+    if stop is not None:
+        stop.set()
+    if task is not None:
+        # Absorb only the server task's own outcome (it may already have died);
+        # cancellation of this coroutine still propagates
+        await asyncio.gather(task, return_exceptions=True)
+
+
 def _create_screenshot_dir() -> Path:
     """Create a timestamped screenshot directory for this run."""
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
@@ -44,28 +173,44 @@ def _create_screenshot_dir() -> Path:
     return screenshot_dir
 
 
-async def _take_screenshot(session: ClientSession, screenshot_dir: Path, step_index: int, step_name: str) -> str:
+async def _take_screenshot(
+    session: ClientSession,
+    screenshot_dir: Path,
+    step_index: int,
+    step_name: str,
+    image_type: str = "jpeg",
+) -> str:
     """
     Take a screenshot after an action and save it to the run's screenshot directory.
     Returns the saved file path or an error message.
+
+    Defaults to viewport-only JPEG: the vision model downsamples screenshots
+    anyway, and JPEG is much smaller and cheaper to encode than PNG.
+    task_executor passes image_type="png" when the agent asks for full fidelity.
     """
     # Sanitize step name for filename
-    safe_name = re.sub(r'[^\w\s-]', '', step_name).strip().replace(' ', '_')[:50]
-    filename = f"{step_index:02d}_{safe_name}.png"
+    safe_name = _UNSAFE_FILENAME_RE.sub('', step_name).strip().replace(' ', '_')[:50]
+    extension = "jpg" if image_type == "jpeg" else image_type
+    filename = f"{step_index:02d}_{safe_name}.{extension}"
     filepath = screenshot_dir / filename
 
     try:
         res = await session.call_tool("browser_take_screenshot", {
-            "filename": str(filepath)
+            "filename": str(filepath),
+            "type": image_type,
         })
 
         # Handle response — might return image data or save to file directly
+        image_data = None
         for block in res.content:
             block_type = getattr(block, "type", None)
             if block_type == "image":
-                # Server returned image data directly — save it
-                with open(filepath, "wb") as f:
-                    f.write(base64.b64decode(block.data))
+                image_data = block.data
+
+        if image_data and not filepath.exists():
+            # Server returned image data without saving it — write it off the
+            # event loop so the disk IO doesn't stall other in-flight MCP calls
+            await asyncio.to_thread(filepath.write_bytes, base64.b64decode(image_data))
 
         if filepath.exists():
             print(f"[TaskExecutor] Screenshot saved: {filepath.name}")
@@ -78,6 +223,185 @@ async def _take_screenshot(session: ClientSession, screenshot_dir: Path, step_in
         return ""
 
 
+async def _get_snapshot(session: ClientSession) -> str:
+    """Return the accessibility snapshot text of the current page ("" if none)."""
+    snapshot_res = await session.call_tool("browser_snapshot", {})
+    for block in snapshot_res.content:
+        if getattr(block, "type", None) == "text":
+            return block.text
+    return ""
+
+
+async def _wait_for_snapshot(
+    session: ClientSession,
+    ready: Callable[[str], bool],
+    timeout: float,
+    interval: float = 0.2,
+) -> str:
+    """
+    Poll the accessibility snapshot until `ready(snapshot)` holds or `timeout` elapses.
+
+    Replaces fixed sleeps before a snapshot: the timeout is the old sleep, so the
+    worst case is unchanged, but pages that settle early no longer wait it out.
+    Returns the last snapshot taken either way.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        snapshot = await _get_snapshot(session)
+        if ready(snapshot) or loop.time() >= deadline:
+            return snapshot
+        await asyncio.sleep(interval)
+
+
+def _refs_with_role(snapshot_text: str, role_re: re.Pattern) -> frozenset[str]:
+    """Refs of the snapshot lines matching `role_re` (e.g. every option or textbox)."""
+    return frozenset(
+        entry.ref
+        for entry in _parse_snapshot(snapshot_text)
+        if role_re.search(entry.lower)
+    )
+
+
+# Readiness checks for _wait_for_snapshot. Each one compares against the page
+# as it was before the action, so elements already on the page (a nav list,
+# the parent form's fields) can't satisfy it early.
+
+def _dropdown_opened(before_snapshot: str) -> Callable[[str], bool]:
+    """Ready once option rows that weren't there before the click have rendered."""
+    before = _refs_with_role(before_snapshot, _OPTION_ROLE_RE)
+    return lambda snap: bool(_refs_with_role(snap, _OPTION_ROLE_RE) - before)
+
+
+def _dropdown_closed(
+    dropdown_ref: str, before_snapshot: str, opened_snapshot: str
+) -> Callable[[str], bool]:
+    """Ready once the dropdown is collapsed and the options it showed are gone."""
+    shown = (
+        _refs_with_role(opened_snapshot, _OPTION_ROLE_RE)
+        - _refs_with_role(before_snapshot, _OPTION_ROLE_RE)
+    )
+
+    def closed(snap: str) -> bool:
+        if not snap or shown & _refs_with_role(snap, _OPTION_ROLE_RE):
+            return False
+        return not any(
+            entry.ref == dropdown_ref and "[expanded]" in entry.lower
+            for entry in _parse_snapshot(snap)
+        )
+
+    return closed
+
+
+def _subform_opened(page_snapshot: str) -> Callable[[str], bool]:
+    """
+    Ready once textboxes the page didn't have before the click have rendered and
+    the set of them held steady across two polls, so a sub-form that renders
+    field by field isn't filled halfway.
+    """
+    before = _refs_with_role(page_snapshot, _TEXTBOX_ROLE_RE)
+    last_seen: frozenset[str] = frozenset()
+
+    def opened(snap: str) -> bool:
+        nonlocal last_seen
+        new_fields = _refs_with_role(snap, _TEXTBOX_ROLE_RE) - before
+        settled = bool(new_fields) and new_fields == last_seen
+        last_seen = new_fields
+        return settled
+
+    return opened
+
+
+def _subform_closed(
+    subform_refs: frozenset[str], element_desc: str
+) -> Callable[[str], bool]:
+    """Ready once the sub-form's own fields are gone and the dropdown is back."""
+    desc_lower = element_desc.lower()
+    return lambda snap: (
+        bool(subform_refs)
+        and not subform_refs & _refs_with_role(snap, _TEXTBOX_ROLE_RE)
+        and desc_lower in snap.lower()
+    )
+
+
+def _snapshot_body(text: str) -> str:
+    """Strip the "Ran Playwright code" / page-state preamble around a yaml snapshot."""
+    start = text.find("```yaml")
+    if start != -1:
+        text = text[start + len("```yaml"):].split("```", 1)[0]
+    return text.strip("\n")
+
+
+def _snapshot_signature(snapshot_text: str) -> tuple[int, int]:
+    """Cheap identity of a page state, used to skip re-capturing an unchanged page."""
+    body = _snapshot_body(snapshot_text)
+    return len(body), hash(body)
+
+
+async def _observe(
+    session: ClientSession,
+    screenshot_dir: Path,
+    step_index: int,
+    step_name: str,
+    image_type: str = "jpeg",
+) -> tuple[str, str]:
+    """
+    Capture the screenshot and the accessibility snapshot of the current page
+    concurrently.
+    Both read the same settled page state, so there is no reason to wait for one
+    before requesting the other.
+    Returns (screenshot_path, snapshot_text); the snapshot is "" if it failed,
+    so the next step simply takes its own.
+    """
+    screenshot_path, snapshot_text = await asyncio.gather(
+        _take_screenshot(
+            session, screenshot_dir, step_index, step_name, image_type
+        ),
+        _get_snapshot(session),
+        return_exceptions=True,
+    )
+    if isinstance(snapshot_text, BaseException):
+        print(
+            f"[TaskExecutor] WARNING: Snapshot failed after '{step_name}': "
+            f"{snapshot_text}"
+        )
+        snapshot_text = ""
+    return screenshot_path, snapshot_text
+
+
+@dataclass(frozen=True)
+class _SnapshotLine:
+    """A single `[ref=...]` line of an accessibility snapshot."""
+
+    ref: str  # Element ref, e.g. "s1e3"
+    text: str  # Stripped snapshot line
+    lower: str  # Lowercased line, for case-insensitive matching
+    after_ref: str  # Text after the ref bracket (current field value, if any)
+
+
+@lru_cache(maxsize=16)
+def _parse_snapshot(snapshot_text: str) -> tuple[_SnapshotLine, ...]:
+    """
+    Split a snapshot into its referenceable lines in one pass.
+
+    Every matcher used to re-split, re-strip and re-lowercase the full snapshot
+    and re-run the ref regex per lookup; several lookups usually hit the same
+    snapshot, so they now share this parsed (and cached) result.
+    """
+    # Built in a single comprehension (no growing list + append per line);
+    # the substring test skips the regex on the many non-referenceable lines.
+    return tuple(
+        _SnapshotLine(
+            ref=ref_match.group(1),
+            text=line_stripped,
+            lower=line_stripped.lower(),
+            after_ref=line_stripped[ref_match.end():].strip(),
+        )
+        for line_stripped in map(str.strip, snapshot_text.split('\n'))
+        if '[ref=' in line_stripped and (ref_match := _REF_RE.search(line_stripped))
+    )
+
+
 def _find_ref_in_snapshot(snapshot_text: str, element_description: str) -> Optional[str]:
     """
     Search the accessibility snapshot text for an element matching the description
@@ -91,48 +415,38 @@ def _find_ref_in_snapshot(snapshot_text: str, element_description: str) -> Optio
     """
     element_lower = element_description.lower()
 
-    # Try to find lines containing [ref=...] and matching the description
-    ref_pattern = re.compile(r'\[ref=([\w\d]+)\]')
-
-    # Generic element names we want to avoid matching *only* on
-    generic_terms = {"button", "input", "textbox", "textarea", "link", "checkbox", "radio", "select"}
+    # The description is the same for every line, so normalise it once:
+    # remove quotes for the exact match, strip quotes and brackets for keywords
+    clean_desc = element_lower.replace('"', '').replace("'", "")
+    clean_desc_words = _NON_WORD_RE.sub(' ', element_lower).split()
+    keywords = [w for w in clean_desc_words if len(w) > 2]
 
+    # Only lines containing [ref=...] can be matched
     best_match = None
-    for line in snapshot_text.split('\n'):
-        line_lower = line.lower().strip()
-        if not line_lower:
-            continue
-
-        ref_match = ref_pattern.search(line)
-        if not ref_match:
-            continue
-
-        ref_value = ref_match.group(1)
+    for entry in _parse_snapshot(snapshot_text):
+        line_lower = entry.lower
 
         # Check for exact substring match first (highest priority)
-        # Remove quotes for cleaner matching
-        clean_desc = element_lower.replace('"', '').replace("'", "")
         if clean_desc and clean_desc in line_lower:
-            print(f"[TaskExecutor] Matched element (exact): '{element_description}' -> ref={ref_value}")
-            return ref_value
+            print(
+                f"[TaskExecutor] Matched element (exact): "
+                f"'{element_description}' -> ref={entry.ref}"
+            )
+            return entry.ref
 
         # Check if description keywords appear in this line
-        # Strip quotes and brackets
-        clean_desc_words = re.sub(r'[^\w\s]', ' ', element_lower).split()
-        keywords = [w for w in clean_desc_words if len(w) > 2]
-
         if not keywords:
             continue
 
-        matches = sum(1 for kw in keywords if kw in line_lower)
+        matched_words = [kw for kw in keywords if kw in line_lower]
+        matches = len(matched_words)
 
         # If the *only* matched words are generic (like "button"), don't blindly click it
-        matched_words = [kw for kw in keywords if kw in line_lower]
-        all_generic = all(mw in generic_terms for mw in matched_words)
+        all_generic = all(mw in _GENERIC_TERMS for mw in matched_words)
 
         if matches > 0 and not all_generic:
             if best_match is None or matches > best_match[1]:
-                best_match = (ref_value, matches, line.strip())
+                best_match = (entry.ref, matches, entry.text)
 
     if best_match:
         print(f"[TaskExecutor] Matched element (fuzzy): '{element_description}' -> ref={best_match[0]} (line: {best_match[2]})")
@@ -190,26 +504,18 @@ def _find_textbox_ref(snapshot_text: str, element_desc: str) -> Optional[str]:
     Find a textbox/input element in the snapshot matching the given description.
     Prioritises exact label matches over fuzzy ones.
     """
-    ref_pattern = re.compile(r'\[ref=([\w\d]+)\]')
-    textbox_roles = {'textbox', 'input', 'textarea', 'searchbox'}
     desc_lower = element_desc.lower().strip()
+    keywords = [w for w in _NON_WORD_RE.sub(' ', desc_lower).split() if len(w) > 2]
 
     candidates = []  # (priority, ref, line)
 
-    for line in snapshot_text.split('\n'):
-        line_stripped = line.strip()
-        line_lower = line_stripped.lower()
-        if not line_lower:
-            continue
-
-        ref_match = ref_pattern.search(line_stripped)
-        if not ref_match:
-            continue
-
-        ref_value = ref_match.group(1)
+    for entry in _parse_snapshot(snapshot_text):
+        line_stripped = entry.text
+        line_lower = entry.lower
+        ref_value = entry.ref
 
         # Only consider textbox-like roles
-        is_textbox = any(role in line_lower for role in textbox_roles)
+        is_textbox = _TEXTBOX_ROLE_RE.search(line_lower) is not None
         if not is_textbox:
             continue
 
@@ -224,7 +530,6 @@ def _find_textbox_ref(snapshot_text: str, element_desc: str) -> Optional[str]:
             continue
 
         # Keyword match
-        keywords = [w for w in re.sub(r'[^\w\s]', ' ', desc_lower).split() if len(w) > 2]
         if keywords:
             match_count = sum(1 for kw in keywords if kw in line_lower)
             if match_count > 0:
@@ -288,45 +593,33 @@ async def _handle_select_action(
     # Click to open the dropdown
     print(f"[TaskExecutor] Opening dropdown | ref={ref} | desc={element_desc}")
     await session.call_tool("browser_click", {"ref": ref, "element": f"Open {element_desc} dropdown"})
-    await asyncio.sleep(1)  # Wait for dropdown to render
 
-    # Take a new snapshot to see the dropdown options
-    snapshot_res = await session.call_tool("browser_snapshot", {})
-    options_snapshot = ""
-    for block in snapshot_res.content:
-        if getattr(block, "type", None) == "text":
-            options_snapshot = block.text
-            break
+    # Take a new snapshot to see the dropdown options, as soon as they render
+    options_snapshot = await _wait_for_snapshot(
+        session, _dropdown_opened(snapshot_text), timeout=1.0
+    )
 
     if not options_snapshot:
         return (False, f"Empty snapshot after opening dropdown {element_desc}")
 
     # Find option elements in the snapshot
-    ref_pattern = re.compile(r'\[ref=([\w\d]+)\]')
-    option_roles = {'option', 'menuitem', 'listitem', 'treeitem'}
     desired_lower = desired_value.lower().strip()
 
     best_option_ref = None
     first_option_ref = None
 
-    for line in options_snapshot.split('\n'):
-        line_stripped = line.strip()
-        line_lower = line_stripped.lower()
-        if not line_lower:
-            continue
-
-        ref_match = ref_pattern.search(line_stripped)
-        if not ref_match:
-            continue
+    for entry in _parse_snapshot(options_snapshot):
+        line_stripped = entry.text
+        line_lower = entry.lower
 
-        is_option = any(role in line_lower for role in option_roles)
+        is_option = _OPTION_ROLE_RE.search(line_lower) is not None
         if not is_option:
             continue
 
-        opt_ref = ref_match.group(1)
+        opt_ref = entry.ref
 
         # Skip placeholder/empty options
-        if any(skip in line_lower for skip in ['select a', 'choose', '--', 'placeholder']):
+        if _PLACEHOLDER_RE.search(line_lower):
             continue
 
         if first_option_ref is None:
@@ -350,32 +643,24 @@ async def _handle_select_action(
     # Close the dropdown first by pressing Escape
     try:
         await session.call_tool("browser_press_key", {"key": "Escape"})
-        await asyncio.sleep(0.5)
     except Exception:
         pass
 
-    # Take a fresh snapshot to find create/add buttons
-    snapshot_res = await session.call_tool("browser_snapshot", {})
-    page_snapshot = ""
-    for block in snapshot_res.content:
-        if getattr(block, "type", None) == "text":
-            page_snapshot = block.text
-            break
+    # Take a fresh snapshot to find create/add buttons, once the dropdown has closed
+    page_snapshot = await _wait_for_snapshot(
+        session, _dropdown_closed(ref, snapshot_text, options_snapshot), timeout=0.5
+    )
 
     # Search for add/create/new buttons or links
     create_keywords = ['add', 'create', 'new']
-    desc_keywords = [w.lower() for w in re.sub(r'[^\w\s]', ' ', element_desc).split() if len(w) > 2]
+    desc_keywords = [
+        w.lower() for w in _NON_WORD_RE.sub(' ', element_desc).split() if len(w) > 2
+    ]
     create_btn_ref = None
 
-    for line in page_snapshot.split('\n'):
-        line_stripped = line.strip()
-        line_lower = line_stripped.lower()
-        if not line_lower:
-            continue
-
-        ref_match = ref_pattern.search(line_stripped)
-        if not ref_match:
-            continue
+    for entry in _parse_snapshot(page_snapshot):
+        line_stripped = entry.text
+        line_lower = entry.lower
 
         # Look for button/link with "add"/"create"/"new" + related keyword
         is_actionable = any(role in line_lower for role in ['button', 'link'])
@@ -389,7 +674,7 @@ async def _handle_select_action(
         # Prefer buttons that also mention the field context (e.g. "Add Contact")
         has_context = any(kw in line_lower for kw in desc_keywords) if desc_keywords else True
         if has_context or create_btn_ref is None:
-            create_btn_ref = (ref_match.group(1), line_stripped)
+            create_btn_ref = (entry.ref, line_stripped)
             if has_context:
                 break  # Perfect match, stop searching
 
@@ -402,40 +687,32 @@ async def _handle_select_action(
         "ref": create_btn_ref[0],
         "element": f"Create new item for {element_desc}"
     })
-    await asyncio.sleep(2)  # Wait for sub-form / new page to load
 
-    # Take snapshot of the sub-form and fill all its fields
-    snapshot_res = await session.call_tool("browser_snapshot", {})
-    subform_snapshot = ""
-    for block in snapshot_res.content:
-        if getattr(block, "type", None) == "text":
-            subform_snapshot = block.text
-            break
+    # Take snapshot of the sub-form (once it has loaded) and fill all its fields
+    subform_snapshot = await _wait_for_snapshot(
+        session, _subform_opened(page_snapshot), timeout=2.0
+    )
 
     if subform_snapshot:
         print("[TaskExecutor] Filling sub-form fields...")
         # Find and fill all textboxes in the sub-form
-        textbox_roles = {'textbox', 'input', 'textarea', 'searchbox'}
-        for line in subform_snapshot.split('\n'):
-            line_stripped = line.strip()
-            line_lower = line_stripped.lower()
-            ref_match = ref_pattern.search(line_stripped)
-            if not ref_match:
-                continue
+        for entry in _parse_snapshot(subform_snapshot):
+            line_stripped = entry.text
+            line_lower = entry.lower
 
-            is_textbox = any(role in line_lower for role in textbox_roles)
+            is_textbox = _TEXTBOX_ROLE_RE.search(line_lower) is not None
             if not is_textbox:
                 continue
 
             # Check if field already has content (text after the ref bracket)
-            after_ref = line_stripped[ref_match.end():].strip().strip(':')
+            after_ref = entry.after_ref.strip(':')
             if after_ref and after_ref not in ['', '""']:
                 continue
 
-            sub_ref = ref_match.group(1)
-            label_match = re.search(r'["\']([^"\']+)["\']', line_stripped)
+            sub_ref = entry.ref
+            label_match = _LABEL_RE.search(line_stripped)
             sub_label = label_match.group(1) if label_match else "field"
-            clean_label = re.sub(r'[\*\s]+$', '', sub_label).strip()
+            clean_label = _TRAILING_MARKS_RE.sub('', sub_label).strip()
             mock_value = f"TEST-HACK-{clean_label.replace(' ', '-')}"
 
             print(f"[TaskExecutor] Sub-form fill | ref={sub_ref} | label={sub_label} | value={mock_value}")
@@ -451,14 +728,11 @@ async def _handle_select_action(
         # Look for a save/submit/create button in the sub-form
         save_keywords = ['save', 'submit', 'create', 'add', 'ok', 'confirm']
         save_btn_ref = None
-        for line in subform_snapshot.split('\n'):
-            line_stripped = line.strip()
-            line_lower = line_stripped.lower()
-            ref_match = ref_pattern.search(line_stripped)
-            if not ref_match:
-                continue
-            if 'button' in line_lower and any(kw in line_lower for kw in save_keywords):
-                save_btn_ref = (ref_match.group(1), line_stripped)
+        for entry in _parse_snapshot(subform_snapshot):
+            if 'button' in entry.lower and any(
+                kw in entry.lower for kw in save_keywords
+            ):
+                save_btn_ref = (entry.ref, entry.text)
                 break
 
         if save_btn_ref:
@@ -467,17 +741,18 @@ async def _handle_select_action(
                 "ref": save_btn_ref[0],
                 "element": f"Save sub-form for {element_desc}"
             })
-            await asyncio.sleep(2)  # Wait for save and redirect back
 
             # Now retry the original dropdown
             print(f"[TaskExecutor] Retrying dropdown '{element_desc}' after creating new item...")
-            # Take a fresh snapshot
-            retry_snapshot_res = await session.call_tool("browser_snapshot", {})
-            retry_snapshot = ""
-            for block in retry_snapshot_res.content:
-                if getattr(block, "type", None) == "text":
-                    retry_snapshot = block.text
-                    break
+            # Take a fresh snapshot once the save has closed the sub-form and
+            # redirected back to the dropdown
+            subform_refs = (
+                _refs_with_role(subform_snapshot, _TEXTBOX_ROLE_RE)
+                - _refs_with_role(page_snapshot, _TEXTBOX_ROLE_RE)
+            )
+            retry_snapshot = await _wait_for_snapshot(
+                session, _subform_closed(subform_refs, element_desc), timeout=2.0
+            )
 
             if retry_snapshot:
                 # Recursive call — but only one level deep
@@ -486,6 +761,40 @@ async def _handle_select_action(
     return (False, f"Created item for '{element_desc}' but could not complete selection")
 
 
+async def _flush_auto_fills(
+    session: ClientSession,
+    screenshot_dir: Path,
+    pending_fills: list,
+    screenshot_paths: list,
+    image_type: str = "jpeg",
+) -> Optional[str]:
+    """
+    Take one screenshot for a run of consecutive auto-fills and emit their step records.
+
+    Typing into a field never needs a capture of the page before the next one,
+    so the fills are all applied first and rendered once (showing every field
+    filled) instead of encoding a near-identical screenshot per field.
+    Returns the screenshot path ("" if it failed), or None if nothing was pending.
+    """
+    if not pending_fills:
+        return None
+
+    last = pending_fills[-1]
+    clean_label = _TRAILING_MARKS_RE.sub('', last.target_element).strip()
+    path = await _take_screenshot(
+        session, screenshot_dir, last.step_number,
+        f"auto_fill_{clean_label}", image_type,
+    )
+    if path:
+        screenshot_paths.append(path)
+
+    for record in pending_fills:
+        record.screenshot_path = path or None
+        _emit_step(record)
+    pending_fills.clear()
+    return path
+
+
 async def _auto_fill_remaining_fields(
     session: ClientSession,
     snapshot_text: str,
@@ -494,11 +803,13 @@ async def _auto_fill_remaining_fields(
     results: list,
     screenshot_paths: list,
     start_url: str,
-) -> int:
+    image_type: str = "jpeg",
+) -> tuple[int, int, str]:
     """
     Take a FRESH snapshot, scan for unfilled form fields, and auto-fill them.
     Detects already-filled fields by checking for content after the ref bracket.
-    Returns updated step_counter.
+    Returns (updated step_counter, number of fields that could not be filled,
+    screenshot of the page as the pass left it or "" if there is none).
     """
     # Take a FRESH snapshot to see the current state of the page
     print("[TaskExecutor] Taking fresh snapshot for auto-fill scan...")
@@ -511,38 +822,35 @@ async def _auto_fill_remaining_fields(
 
     if not fresh_snapshot:
         print("[TaskExecutor] WARNING: Empty snapshot for auto-fill")
-        return step_counter
+        results.append("Auto-fill skipped - empty snapshot")
+        return step_counter, 1, ""
 
-    ref_pattern = re.compile(r'\[ref=([\w\d]+)\]')
-    textbox_roles = {'textbox', 'input', 'textarea', 'searchbox'}
-    dropdown_roles = {'combobox', 'listbox', 'select'}
+    # Step records of consecutive textbox fills, waiting for their shared screenshot
+    pending_fills: list[StepRecord] = []
+    failures = 0
+    # Latest screenshot, as long as nothing has touched the page since it was taken
+    last_capture = ""
 
-    for line in fresh_snapshot.split('\n'):
-        line_stripped = line.strip()
-        line_lower = line_stripped.lower()
-        if not line_lower:
-            continue
-
-        ref_match = ref_pattern.search(line_stripped)
-        if not ref_match:
-            continue
-        ref_value = ref_match.group(1)
+    for entry in _parse_snapshot(fresh_snapshot):
+        line_stripped = entry.text
+        line_lower = entry.lower
+        ref_value = entry.ref
 
         # Extract the label from the snapshot line (e.g., textbox "Client Name *")
-        label_match = re.search(r'["\']([^"\']+)["\']', line_stripped)
+        label_match = _LABEL_RE.search(line_stripped)
         label = label_match.group(1) if label_match else "field"
 
-        is_textbox = any(role in line_lower for role in textbox_roles)
-        is_dropdown = any(role in line_lower for role in dropdown_roles)
+        is_textbox = _TEXTBOX_ROLE_RE.search(line_lower) is not None
+        is_dropdown = _DROPDOWN_ROLE_RE.search(line_lower) is not None
 
         if is_textbox:
-            after_ref = line_stripped[ref_match.end():].strip()
+            after_ref = entry.after_ref
             after_ref_clean = after_ref.lstrip(':').strip()
             if after_ref_clean:
                 print(f"[TaskExecutor] Skipping already-filled textbox: '{label}' (value: {after_ref_clean[:30]}...)")
                 continue
 
-            clean_label = re.sub(r'[\*\s]+$', '', label).strip()
+            clean_label = _TRAILING_MARKS_RE.sub('', label).strip()
             mock_value = f"TEST-HACK-{clean_label.replace(' ', '-')}"
             print(f"[TaskExecutor] Auto-filling textbox | ref={ref_value} | label={label} | value={mock_value}")
             try:
@@ -554,11 +862,8 @@ async def _auto_fill_remaining_fields(
                 result_msg = f"Auto-filled '{mock_value}' into '{label}'"
                 results.append(result_msg)
                 step_counter += 1
-                path = await _take_screenshot(session, screenshot_dir, step_counter, f"auto_fill_{clean_label}")
-                if path:
-                    screenshot_paths.append(path)
 
-                _emit_step(StepRecord(
+                pending_fills.append(StepRecord(
                     step_number=step_counter,
                     action="auto_fill",
                     target_element=label,
@@ -566,30 +871,46 @@ async def _auto_fill_remaining_fields(
                     match_type="exact",
                     value=mock_value,
                     accessibility_snapshot=fresh_snapshot,
-                    screenshot_path=path or None,
                     result=result_msg,
                     url=start_url,
                 ))
             except Exception as e:
                 print(f"[TaskExecutor] WARNING: Auto-fill failed for '{label}': {e}")
+                results.append(f"Auto-fill failed for '{label}': {e}")
+                failures += 1
+                last_capture = ""
 
         elif is_dropdown:
-            after_ref = line_stripped[ref_match.end():].strip()
+            # Dropdowns change the page, so capture the fills typed so far first
+            captured = await _flush_auto_fills(
+                session, screenshot_dir, pending_fills, screenshot_paths, image_type
+            )
+            if captured is not None:
+                last_capture = captured
+
+            after_ref = entry.after_ref
             after_ref_clean = after_ref.lstrip(':').strip()
-            if after_ref_clean and not any(skip in after_ref_clean.lower() for skip in ['select a', 'choose', '--', 'placeholder']):
+            if after_ref_clean and not _PLACEHOLDER_RE.search(after_ref_clean.lower()):
                 print(f"[TaskExecutor] Skipping already-selected dropdown: '{label}' (value: {after_ref_clean[:30]}...)")
                 continue
 
-            clean_label = re.sub(r'[\*\s]+$', '', label).strip()
+            clean_label = _TRAILING_MARKS_RE.sub('', label).strip()
             print(f"[TaskExecutor] Auto-selecting dropdown | ref={ref_value} | label={label}")
+            last_capture = ""
             try:
                 success, msg = await _handle_select_action(session, fresh_snapshot, clean_label, "")
                 result_msg = f"Auto-select {clean_label}: {msg}"
                 results.append(result_msg)
+                if not success:
+                    failures += 1
                 step_counter += 1
-                path = await _take_screenshot(session, screenshot_dir, step_counter, f"auto_select_{clean_label}")
+                path = await _take_screenshot(
+                    session, screenshot_dir, step_counter,
+                    f"auto_select_{clean_label}", image_type,
+                )
                 if path:
                     screenshot_paths.append(path)
+                last_capture = path
 
                 _emit_step(StepRecord(
                     step_number=step_counter,
@@ -604,38 +925,34 @@ async def _auto_fill_remaining_fields(
                 ))
             except Exception as e:
                 print(f"[TaskExecutor] WARNING: Auto-select failed for '{label}': {e}")
+                results.append(f"Auto-select failed for '{label}': {e}")
+                failures += 1
 
-    return step_counter
+    captured = await _flush_auto_fills(
+        session, screenshot_dir, pending_fills, screenshot_paths, image_type
+    )
+    if captured is not None:
+        last_capture = captured
+    return step_counter, failures, last_capture
 
 
 @tool
-async def task_executor(flow_string: str, start_url: str) -> str:
+async def task_executor(
+    flow_string: str, start_url: str, screenshot_type: str = "jpeg"
+) -> str:
     """
     Executes a sequence of UI actions iteratively on the specified start_url using Playwright MCP.
     flow_string: A sequence of UI interactions indicated by arrows or steps (e.g., "search box -> type 'hello world' -> click Search").
     start_url: The URL to navigate to before performing the steps.
+    screenshot_type: "jpeg" (default, small and fast) or "png" (lossless, for
+    flows whose screenshots need full fidelity, e.g. to read small text).
 
     Takes a screenshot after each action and saves them in a timestamped folder
     under src/agents/action/screenshots/.
     """
-    # Connect to your existing open Chrome using the Playwright MCP Bridge extension!
-    # Make sure you have the extension installed in your Chrome browser.
-
-    # The environment variable is loaded by dotenv in run_action_agent.py.
-    # Pass it specifically in the env dictionary to the MCP server.
-    token = os.getenv("PLAYWRIGHT_MCP_EXTENSION_TOKEN")
-
-    server_params = StdioServerParameters(
-        command="npx",
-        args=[
-            "@playwright/mcp@latest",
-            "--extension"
-        ],
-        env={"PLAYWRIGHT_MCP_EXTENSION_TOKEN": token} if token else {}
-    )
-
     results = []
     screenshot_paths = []
+    image_type = "png" if screenshot_type.lower() == "png" else "jpeg"
 
     # Very basic parsing by arrows
     steps = [s.strip() for s in flow_string.split("->") if s.strip()]
@@ -645,301 +962,351 @@ async def task_executor(flow_string: str, start_url: str) -> str:
     # Create timestamped screenshot directory for this run
     screenshot_dir = _create_screenshot_dir()
     step_counter = 0
+    failed_steps = 0
 
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                print("[TaskExecutor] MCP session initialized")
-
-                # Navigate to the start URL
-                print(f"[TaskExecutor] Navigating to {start_url}")
-                results.append(f"Navigating to {start_url}...")
-                await session.call_tool("browser_navigate", {"url": start_url})
-
-                # Screenshot after navigation
-                step_counter += 1
-                path = await _take_screenshot(session, screenshot_dir, step_counter, f"navigate_{start_url.split('//')[1][:30]}")
-                if path:
-                    screenshot_paths.append(path)
-
-                _emit_step(StepRecord(
-                    step_number=step_counter,
-                    action="navigate",
-                    target_element=start_url,
-                    matched_element=None,
-                    match_type="none",
-                    value=None,
-                    accessibility_snapshot="",
-                    screenshot_path=path or None,
-                    result=f"Navigated to {start_url}",
-                    url=start_url,
-                ))
-
-                for step in steps:
-                    step_lower = step.lower()
-                    try:
-                        # Take a snapshot to get current page state and element refs
-                        print(f"[TaskExecutor] Taking snapshot for step: {step}")
-                        snapshot_res = await session.call_tool("browser_snapshot", {})
-                        snapshot_text = ""
-                        for block in snapshot_res.content:
-                            if getattr(block, "type", None) == "text":
-                                snapshot_text = block.text
-                                break
-
-                        if not snapshot_text:
-                            print("[TaskExecutor] WARNING: Empty snapshot, skipping step")
-                            results.append(f"Skipped '{step}' - empty snapshot")
-                            continue
-
-                        # Determine action type and extract value if present
-                        # Use the robust parsers for fill/type and select steps
-                        parsed_fill = _parse_fill_step(step)
-                        parsed_select = _parse_select_step(step)
-
-                        is_hover_action = "hover" in step_lower
-                        is_click_action = "click" in step_lower or "press" in step_lower
-                        is_wait_action = "wait" in step_lower
-                        is_snapshot_fill = "snapshot_and_fill_remaining" in step_lower
-
-                        action_done = False
-                        action_type = "unknown"
-                        target_element = step
-                        matched_element = None
-                        match_type = "none"
-                        action_value = None
-                        result_msg = ""
-                        error_msg = None
-
-                        if is_wait_action:
-                            action_type = "wait"
-                            wait_match = re.search(r"wait\s*(\d+)", step_lower)
-                            seconds = int(wait_match.group(1)) if wait_match else 2
-                            target_element = f"{seconds} seconds"
-                            print(f"[TaskExecutor] Waiting {seconds} seconds...")
-                            await asyncio.sleep(seconds)
-                            result_msg = f"Waited {seconds} seconds"
+        session = await _get_mcp_session()
+
+        # Navigate to the start URL
+        print(f"[TaskExecutor] Navigating to {start_url}")
+        results.append(f"Navigating to {start_url}...")
+        await session.call_tool("browser_navigate", {"url": start_url})
+
+        # Screenshot after navigation (the snapshot is reused by the first step)
+        step_counter += 1
+        path, pending_snapshot = await _observe(
+            session,
+            screenshot_dir,
+            step_counter,
+            f"navigate_{start_url.split('//')[1][:30]}",
+            image_type=image_type,
+        )
+        # Page state behind the most recent screenshot, to skip redundant ones
+        last_signature, last_path = _snapshot_signature(pending_snapshot), path
+        if path:
+            screenshot_paths.append(path)
+
+        _emit_step(StepRecord(
+            step_number=step_counter,
+            action="navigate",
+            target_element=start_url,
+            matched_element=None,
+            match_type="none",
+            value=None,
+            accessibility_snapshot="",
+            screenshot_path=path or None,
+            result=f"Navigated to {start_url}",
+            url=start_url,
+        ))
+
+        for step in steps:
+            step_lower = step.lower()
+            try:
+                # Get current page state and element refs, reusing the snapshot
+                # captured alongside the previous screenshot when there is one
+                if pending_snapshot:
+                    snapshot_text, pending_snapshot = pending_snapshot, ""
+                else:
+                    print(f"[TaskExecutor] Taking snapshot for step: {step}")
+                    snapshot_text = await _get_snapshot(session)
+
+                if not snapshot_text:
+                    print("[TaskExecutor] WARNING: Empty snapshot, skipping step")
+                    results.append(f"Skipped '{step}' - empty snapshot")
+                    failed_steps += 1
+                    continue
+
+                # Determine action type and extract value if present
+                # Use the robust parsers for fill/type and select steps
+                parsed_fill = _parse_fill_step(step)
+                parsed_select = _parse_select_step(step)
+
+                is_hover_action = "hover" in step_lower
+                is_click_action = "click" in step_lower or "press" in step_lower
+                is_wait_action = "wait" in step_lower
+                is_snapshot_fill = "snapshot_and_fill_remaining" in step_lower
+
+                action_done = False
+                reused_screenshot = ""  # Capture the action already took, if any
+                action_type = "unknown"
+                target_element = step
+                matched_element = None
+                match_type = "none"
+                action_value = None
+                result_msg = ""
+                error_msg = None
+
+                if is_wait_action:
+                    action_type = "wait"
+                    wait_match = re.search(r"wait\s*(\d+)", step_lower)
+                    seconds = int(wait_match.group(1)) if wait_match else 2
+                    target_element = f"{seconds} seconds"
+                    print(f"[TaskExecutor] Waiting {seconds} seconds...")
+                    await asyncio.sleep(seconds)
+                    result_msg = f"Waited {seconds} seconds"
+                    results.append(result_msg)
+                    action_done = True
+
+                elif parsed_fill is not None:
+                    action_type = "fill"
+                    element_desc, value = parsed_fill
+                    action_value = value
+                    target_element = element_desc or step
+                    print(f"[TaskExecutor] Parsed fill step | element='{element_desc}' | value='{value}'")
+
+                    ref = _find_textbox_ref(snapshot_text, element_desc)
+                    if not ref:
+                        ref = _find_ref_in_snapshot(snapshot_text, element_desc or step)
+
+                    if ref:
+                        # Determine match type
+                        match_type = "exact" if element_desc.lower() in snapshot_text.lower() else "fuzzy"
+                        matched_element = f"ref={ref}"
+                        print(f"[TaskExecutor] Typing | ref={ref} | text={value}")
+                        try:
+                            await session.call_tool("browser_type", {
+                                "ref": ref,
+                                "text": value,
+                                "slowly": True
+                            })
+                            result_msg = f"Typed '{value}' into element ref={ref}"
                             results.append(result_msg)
                             action_done = True
-
-                        elif parsed_fill is not None:
-                            action_type = "fill"
-                            element_desc, value = parsed_fill
-                            action_value = value
-                            target_element = element_desc or step
-                            print(f"[TaskExecutor] Parsed fill step | element='{element_desc}' | value='{value}'")
-
-                            ref = _find_textbox_ref(snapshot_text, element_desc)
-                            if not ref:
-                                ref = _find_ref_in_snapshot(snapshot_text, element_desc or step)
-
-                            if ref:
-                                # Determine match type
-                                match_type = "exact" if element_desc.lower() in snapshot_text.lower() else "fuzzy"
-                                matched_element = f"ref={ref}"
-                                print(f"[TaskExecutor] Typing | ref={ref} | text={value}")
-                                try:
-                                    await session.call_tool("browser_type", {
+                        except Exception as type_err:
+                            print(f"[TaskExecutor] browser_type failed, trying browser_fill_form fallback: {type_err}")
+                            try:
+                                await session.call_tool("browser_fill_form", {
+                                    "fields": [{
+                                        "name": element_desc or "text field",
+                                        "type": "textbox",
                                         "ref": ref,
-                                        "text": value,
-                                        "slowly": True
-                                    })
-                                    result_msg = f"Typed '{value}' into element ref={ref}"
-                                    results.append(result_msg)
-                                    action_done = True
-                                except Exception as type_err:
-                                    print(f"[TaskExecutor] browser_type failed, trying browser_fill_form fallback: {type_err}")
-                                    try:
-                                        await session.call_tool("browser_fill_form", {
-                                            "fields": [{
-                                                "name": element_desc or "text field",
-                                                "type": "textbox",
-                                                "ref": ref,
-                                                "value": value
-                                            }]
-                                        })
-                                        result_msg = f"Filled '{value}' into element ref={ref} (via fill_form)"
-                                        results.append(result_msg)
-                                        action_done = True
-                                    except Exception as fill_err:
-                                        print(f"[TaskExecutor] browser_fill_form also failed: {fill_err}")
-                                        result_msg = f"Could not type into element ref={ref}: {type_err}"
-                                        error_msg = str(fill_err)
-                                        results.append(result_msg)
-                            else:
-                                match_type = "not_found"
-                                print(f"[TaskExecutor] WARNING: Could not find input element for: {step}")
-                                result_msg = f"Could not find input element for: {step}"
-                                error_msg = "Element not found in accessibility snapshot"
-                                results.append(result_msg)
-
-                        elif parsed_select is not None:
-                            action_type = "select"
-                            element_desc, desired_value = parsed_select
-                            action_value = desired_value
-                            target_element = element_desc
-                            print(f"[TaskExecutor] Parsed select step | element='{element_desc}' | value='{desired_value}'")
-                            success, msg = await _handle_select_action(
-                                session, snapshot_text, element_desc, desired_value
-                            )
-                            result_msg = msg
-                            results.append(msg)
-                            action_done = success
-                            match_type = "exact" if success else "not_found"
-                            if success:
-                                matched_element = element_desc
-
-                        elif is_snapshot_fill:
-                            action_type = "auto_fill"
-                            target_element = "all remaining fields"
-                            print("[TaskExecutor] Running snapshot_and_fill_remaining...")
-                            step_counter = await _auto_fill_remaining_fields(
-                                session, snapshot_text, screenshot_dir,
-                                step_counter, results, screenshot_paths,
-                                start_url,
-                            )
-                            result_msg = "Completed auto-fill of remaining fields"
-                            results.append(result_msg)
-                            action_done = True
-                            match_type = "exact"
-
-                        elif is_hover_action:
-                            action_type = "hover"
-                            hover_target = re.sub(r'hover\s*(on|over)?\s*', '', step_lower).strip()
-                            target_element = hover_target or step
-                            ref = _find_ref_in_snapshot(snapshot_text, hover_target or step)
-
-                            if ref:
-                                matched_element = f"ref={ref}"
-                                match_type = "fuzzy"
-                                print(f"[TaskExecutor] Hovering | ref={ref}")
-                                await session.call_tool("browser_hover", {
-                                    "ref": ref,
-                                    "element": step
+                                        "value": value
+                                    }]
                                 })
-                                result_msg = f"Hovered over element ref={ref}"
+                                result_msg = f"Filled '{value}' into element ref={ref} (via fill_form)"
                                 results.append(result_msg)
                                 action_done = True
-                            else:
-                                match_type = "not_found"
-                                print(f"[TaskExecutor] WARNING: Could not find element to hover: {step}")
-                                result_msg = f"Could not find hover target: {step}"
-                                error_msg = "Element not found"
+                            except Exception as fill_err:
+                                print(f"[TaskExecutor] browser_fill_form also failed: {fill_err}")
+                                result_msg = f"Could not type into element ref={ref}: {type_err}"
+                                error_msg = str(fill_err)
                                 results.append(result_msg)
+                    else:
+                        match_type = "not_found"
+                        print(f"[TaskExecutor] WARNING: Could not find input element for: {step}")
+                        result_msg = f"Could not find input element for: {step}"
+                        error_msg = "Element not found in accessibility snapshot"
+                        results.append(result_msg)
+
+                elif parsed_select is not None:
+                    action_type = "select"
+                    element_desc, desired_value = parsed_select
+                    action_value = desired_value
+                    target_element = element_desc
+                    print(f"[TaskExecutor] Parsed select step | element='{element_desc}' | value='{desired_value}'")
+                    success, msg = await _handle_select_action(
+                        session, snapshot_text, element_desc, desired_value
+                    )
+                    result_msg = msg
+                    results.append(msg)
+                    action_done = success
+                    match_type = "exact" if success else "not_found"
+                    if success:
+                        matched_element = element_desc
+
+                elif is_snapshot_fill:
+                    action_type = "auto_fill"
+                    target_element = "all remaining fields"
+                    print("[TaskExecutor] Running snapshot_and_fill_remaining...")
+                    (
+                        step_counter, auto_fill_failures, reused_screenshot,
+                    ) = await _auto_fill_remaining_fields(
+                        session, snapshot_text, screenshot_dir,
+                        step_counter, results, screenshot_paths,
+                        start_url, image_type,
+                    )
+                    # The step itself ran; count the individual fields it couldn't fill
+                    failed_steps += auto_fill_failures
+                    result_msg = "Completed auto-fill of remaining fields"
+                    results.append(result_msg)
+                    action_done = True
+                    match_type = "exact"
+
+                elif is_hover_action:
+                    action_type = "hover"
+                    hover_target = re.sub(r'hover\s*(on|over)?\s*', '', step_lower).strip()
+                    target_element = hover_target or step
+                    ref = _find_ref_in_snapshot(snapshot_text, hover_target or step)
+
+                    if ref:
+                        matched_element = f"ref={ref}"
+                        match_type = "fuzzy"
+                        print(f"[TaskExecutor] Hovering | ref={ref}")
+                        await session.call_tool("browser_hover", {
+                            "ref": ref,
+                            "element": step
+                        })
+                        result_msg = f"Hovered over element ref={ref}"
+                        results.append(result_msg)
+                        action_done = True
+                    else:
+                        match_type = "not_found"
+                        print(f"[TaskExecutor] WARNING: Could not find element to hover: {step}")
+                        result_msg = f"Could not find hover target: {step}"
+                        error_msg = "Element not found"
+                        results.append(result_msg)
+
+                elif is_click_action:
+                    action_type = "click"
+                    click_target = re.sub(r'(click|press)\s*(on)?\s*', '', step_lower).strip()
+                    target_element = click_target or step
+                    ref = _find_ref_in_snapshot(snapshot_text, click_target or step)
+
+                    if ref:
+                        matched_element = f"ref={ref}"
+                        match_type = "fuzzy"
+                        print(f"[TaskExecutor] Clicking | ref={ref}")
+                        await session.call_tool("browser_click", {
+                            "ref": ref,
+                            "element": step
+                        })
+                        result_msg = f"Clicked element ref={ref}"
+                        results.append(result_msg)
+                        action_done = True
+                    else:
+                        match_type = "not_found"
+                        print(f"[TaskExecutor] WARNING: Could not find element to click: {step}")
+                        result_msg = f"Could not find click target: {step}"
+                        error_msg = "Element not found"
+                        results.append(result_msg)
+                else:
+                    action_type = "click"
+                    ref = _find_ref_in_snapshot(snapshot_text, step)
+                    if ref:
+                        matched_element = f"ref={ref}"
+                        match_type = "fuzzy"
+                        print(f"[TaskExecutor] Clicking (default) | ref={ref}")
+                        await session.call_tool("browser_click", {
+                            "ref": ref,
+                            "element": step
+                        })
+                        result_msg = f"Clicked '{step}' ref={ref}"
+                        results.append(result_msg)
+                        action_done = True
+                    else:
+                        match_type = "not_found"
+                        print(f"[TaskExecutor] WARNING: Could not find element: {step}")
+                        result_msg = f"Could not find element: {step}"
+                        error_msg = "Element not found"
+                        results.append(result_msg)
+
+                # Take screenshot after each completed action
+                screenshot_path = None
+                if action_done and reused_screenshot:
+                    # The page is exactly as the action's own last capture shows
+                    # it; only the snapshot for the next step is still needed
+                    step_counter += 1
+                    screenshot_path = reused_screenshot
+                    pending_snapshot = await _get_snapshot(session)
+                    last_signature = _snapshot_signature(pending_snapshot)
+                    last_path = screenshot_path
+                elif action_done:
+                    step_counter += 1
+                    screenshot_path, pending_snapshot = await _observe(
+                        session, screenshot_dir, step_counter, step,
+                        image_type=image_type,
+                    )
+                    last_signature = _snapshot_signature(pending_snapshot)
+                    last_path = screenshot_path
+                    if screenshot_path:
+                        screenshot_paths.append(screenshot_path)
+                else:
+                    failed_steps += 1
+
+                # Emit step record
+                _emit_step(StepRecord(
+                    step_number=step_counter if action_done else step_counter + 1,
+                    action=action_type,
+                    target_element=target_element,
+                    matched_element=matched_element,
+                    match_type=match_type,
+                    value=action_value,
+                    accessibility_snapshot=snapshot_text,
+                    screenshot_path=screenshot_path,
+                    result=result_msg,
+                    url=start_url,
+                    error=error_msg,
+                ))
 
-                        elif is_click_action:
-                            action_type = "click"
-                            click_target = re.sub(r'(click|press)\s*(on)?\s*', '', step_lower).strip()
-                            target_element = click_target or step
-                            ref = _find_ref_in_snapshot(snapshot_text, click_target or step)
-
-                            if ref:
-                                matched_element = f"ref={ref}"
-                                match_type = "fuzzy"
-                                print(f"[TaskExecutor] Clicking | ref={ref}")
-                                await session.call_tool("browser_click", {
-                                    "ref": ref,
-                                    "element": step
-                                })
-                                result_msg = f"Clicked element ref={ref}"
-                                results.append(result_msg)
-                                action_done = True
-                            else:
-                                match_type = "not_found"
-                                print(f"[TaskExecutor] WARNING: Could not find element to click: {step}")
-                                result_msg = f"Could not find click target: {step}"
-                                error_msg = "Element not found"
-                                results.append(result_msg)
-                        else:
-                            action_type = "click"
-                            ref = _find_ref_in_snapshot(snapshot_text, step)
-                            if ref:
-                                matched_element = f"ref={ref}"
-                                match_type = "fuzzy"
-                                print(f"[TaskExecutor] Clicking (default) | ref={ref}")
-                                await session.call_tool("browser_click", {
-                                    "ref": ref,
-                                    "element": step
-                                })
-                                result_msg = f"Clicked '{step}' ref={ref}"
-                                results.append(result_msg)
-                                action_done = True
-                            else:
-                                match_type = "not_found"
-                                print(f"[TaskExecutor] WARNING: Could not find element: {step}")
-                                result_msg = f"Could not find element: {step}"
-                                error_msg = "Element not found"
-                                results.append(result_msg)
+            except Exception as e:
+                print(f"[TaskExecutor] ERROR: Action step failed | step={step} | error={e}")
+                results.append(f"Failed step '{step}': {e}")
+                failed_steps += 1
 
-                        # Take screenshot after each completed action
-                        screenshot_path = None
-                        if action_done:
-                            step_counter += 1
-                            screenshot_path = await _take_screenshot(session, screenshot_dir, step_counter, step)
-                            if screenshot_path:
-                                screenshot_paths.append(screenshot_path)
-
-                        # Emit step record
-                        _emit_step(StepRecord(
-                            step_number=step_counter if action_done else step_counter + 1,
-                            action=action_type,
-                            target_element=target_element,
-                            matched_element=matched_element,
-                            match_type=match_type,
-                            value=action_value,
-                            accessibility_snapshot=snapshot_text,
-                            screenshot_path=screenshot_path,
-                            result=result_msg,
-                            url=start_url,
-                            error=error_msg,
-                        ))
-
-                    except Exception as e:
-                        print(f"[TaskExecutor] ERROR: Action step failed | step={step} | error={e}")
-                        results.append(f"Failed step '{step}': {e}")
-
-                        step_counter += 1
-                        err_path = await _take_screenshot(session, screenshot_dir, step_counter, f"error_{step}")
-
-                        _emit_step(StepRecord(
-                            step_number=step_counter,
-                            action="error",
-                            target_element=step,
-                            match_type="not_found",
-                            accessibility_snapshot=snapshot_text if 'snapshot_text' in dir() else "",
-                            screenshot_path=err_path or None,
-                            result=f"Failed: {e}",
-                            url=start_url,
-                            error=str(e),
-                        ))
-                        break
-
-                # Final screenshot
                 step_counter += 1
-                print("[TaskExecutor] Capturing final screenshot")
-                path = await _take_screenshot(session, screenshot_dir, step_counter, "final_state")
-                if path:
-                    screenshot_paths.append(path)
+                err_path = await _take_screenshot(
+                    session, screenshot_dir, step_counter, f"error_{step}", image_type
+                )
+                last_path = None
 
                 _emit_step(StepRecord(
                     step_number=step_counter,
-                    action="final_screenshot",
-                    target_element="final page state",
-                    match_type="none",
-                    screenshot_path=path or None,
-                    result="Final screenshot captured",
+                    action="error",
+                    target_element=step,
+                    match_type="not_found",
+                    accessibility_snapshot=snapshot_text if 'snapshot_text' in dir() else "",
+                    screenshot_path=err_path or None,
+                    result=f"Failed: {e}",
                     url=start_url,
+                    error=str(e),
                 ))
+                break
+
+        # Final screenshot — reuse the last one if the page hasn't changed since
+        step_counter += 1
+        final_snapshot = await _get_snapshot(session)
+        if (
+            last_path
+            and final_snapshot
+            and _snapshot_signature(final_snapshot) == last_signature
+        ):
+            print(
+                "[TaskExecutor] Page unchanged since last screenshot, "
+                "reusing it as final state"
+            )
+            path = last_path
+        else:
+            print("[TaskExecutor] Capturing final screenshot")
+            path = await _take_screenshot(
+                session, screenshot_dir, step_counter, "final_state", image_type
+            )
+            if path:
+                screenshot_paths.append(path)
+
+        _emit_step(StepRecord(
+            step_number=step_counter,
+            action="final_screenshot",
+            target_element="final page state",
+            match_type="none",
+            screenshot_path=path or None,
+            result="Final screenshot captured",
+            url=start_url,
+        ))
 
     except Exception as e:
         print(f"[TaskExecutor] ERROR: MCP Playwright error | error={e}")
         results.append(f"MCP Playwright Server Error: {str(e)}")
+        failed_steps += 1
+        # Drop the shared session so the next call starts a fresh server
+        await close_mcp_session()
 
-    # Summary
+    # Summary. Per-file names are left out: every step's screenshot is already
+    # on its StepRecord, and the listing only cost the model tokens to re-read.
     results.append(f"\nScreenshots saved to: {screenshot_dir}")
     results.append(f"Total screenshots: {len(screenshot_paths)}")
-    for sp in screenshot_paths:
-        results.append(f"  - {Path(sp).name}")
+    if failed_steps:
+        results.append(f"Status: {failed_steps} action(s) failed")
+    else:
+        results.append(ALL_STEPS_SUCCEEDED)
 
     return "\n".join(results)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -122,10 +123,7 @@ class DiscoveryAgent:
         Returns:
             List of ScribeOutput objects, one per flow
         """
-        from src.agents.scribe import ScribeAgent, FlowExecutionRecord, StepRecord
         from src.agents.scribe.flow_parser import parse_flows_markdown
-        from src.agents.action.agent import ActionAgent
-        from src.agents.action.tools import set_step_callback
 
         # Phase 1: Discover flows (reuse existing logic)
         discovery_result = self.discover_flows(initial_query)
@@ -136,73 +134,111 @@ class DiscoveryAgent:
             f"\n[bold cyan]Step 4/5: Executing {len(parsed_flows)} flows in browser...[/bold cyan]"
         )
 
+        # Phases 3-4 run on a single event loop so the browser session is
+        # shared by every flow instead of being restarted per asyncio.run()
+        return asyncio.run(
+            self._execute_and_document(
+                parsed_flows, target_url, discovery_result.codebase_summary
+            )
+        )
+
+    async def _execute_and_document(
+        self,
+        parsed_flows: List,
+        target_url: str,
+        codebase_summary: str,
+    ) -> List:
+        """
+        Execute each parsed flow in the browser and document it.
+
+        Args:
+            parsed_flows: ParsedFlow blocks to execute, in order
+            target_url: The live application URL to execute flows against
+            codebase_summary: Codebase knowledge from discovery
+
+        Returns:
+            List of ScribeOutput objects, one per documented flow
+        """
+        from src.agents.scribe import ScribeAgent, FlowExecutionRecord, StepRecord
+        from src.agents.action.agent import ActionAgent
+        from src.agents.action.tools import ALL_STEPS_SUCCEEDED, set_step_callback
+
         # Phase 3: Execute each flow and collect step records
+        # One agent per event loop: its async HTTP client is bound to the loop
         action_agent = ActionAgent()
         scribe_agent = ScribeAgent(repo_path=self.repo_path)
         scribe_outputs = []
 
-        for i, pflow in enumerate(parsed_flows, 1):
-            console.print(
-                f"\n[bold yellow]--- Flow {i}/{len(parsed_flows)}: {pflow.name} ({pflow.priority}) ---[/bold yellow]"
-            )
+        try:
+            for i, pflow in enumerate(parsed_flows, 1):
+                console.print(
+                    f"\n[bold yellow]--- Flow {i}/{len(parsed_flows)}: {pflow.name} ({pflow.priority}) ---[/bold yellow]"
+                )
 
-            # Set up step record collection via the global callback
-            collected_steps: List[StepRecord] = []
+                # Set up step record collection via the global callback
+                collected_steps: List[StepRecord] = []
 
-            def _collect(record: StepRecord, _steps=collected_steps) -> None:
-                _steps.append(record)
+                def _collect(record: StepRecord, _steps=collected_steps) -> None:
+                    _steps.append(record)
 
-            set_step_callback(_collect)
+                set_step_callback(_collect)
 
-            started_at = datetime.now()
-            try:
-                result_text = asyncio.run(
-                    action_agent.run(instruction=pflow.markdown, url=target_url)
-                )
-                # ActionAgent.run() may return a list (LangChain content blocks) or a string
-                if isinstance(result_text, list):
-                    result_text = "\n".join(
-                        block.get("text", str(block)) if isinstance(block, dict) else str(block)
-                        for block in result_text
+                started_at = datetime.now()
+                try:
+                    result_text = await action_agent.run(
+                        instruction=pflow.markdown, url=target_url
                     )
-                result_text = str(result_text)
-                success = "error" not in result_text.lower()[:100]
-            except Exception as exc:
-                logger.error("flow_execution_failed", flow=pflow.name, error=str(exc))
-                console.print(f"[red]Execution failed for {pflow.name}: {exc}[/red]")
-                result_text = f"Execution failed: {exc}"
-                success = False
-            finally:
-                set_step_callback(None)  # Clear callback
-
-            finished_at = datetime.now()
-
-            # Build the execution record
-            execution_record = FlowExecutionRecord(
-                flow_name=pflow.name,
-                flow_markdown=pflow.markdown,
-                start_url=target_url,
-                steps=collected_steps,
-                screenshot_dir=self._extract_screenshot_dir(result_text),
-                success=success,
-                started_at=started_at,
-                finished_at=finished_at,
-            )
+                    # ActionAgent.run() may return a list (LangChain content blocks) or a string
+                    if isinstance(result_text, list):
+                        result_text = "\n".join(
+                            block.get("text", str(block)) if isinstance(block, dict) else str(block)
+                            for block in result_text
+                        )
+                    result_text = str(result_text)
+                    # Only a clean task_executor report carries the success status
+                    # line; the report's head echoes URLs and typed values
+                    success = ALL_STEPS_SUCCEEDED in result_text
+                except Exception as exc:
+                    logger.error("flow_execution_failed", flow=pflow.name, error=str(exc))
+                    console.print(f"[red]Execution failed for {pflow.name}: {exc}[/red]")
+                    result_text = f"Execution failed: {exc}"
+                    success = False
+                finally:
+                    set_step_callback(None)  # Clear callback
+
+                finished_at = datetime.now()
+
+                # Build the execution record
+                execution_record = FlowExecutionRecord(
+                    flow_name=pflow.name,
+                    flow_markdown=pflow.markdown,
+                    start_url=target_url,
+                    steps=collected_steps,
+                    screenshot_dir=self._extract_screenshot_dir(result_text),
+                    success=success,
+                    started_at=started_at,
+                    finished_at=finished_at,
+                )
 
-            # Phase 4: Generate documentation via scribe
-            console.print(
-                f"[bold cyan]Step 5/5: Generating documentation for {pflow.name}...[/bold cyan]"
-            )
-            try:
-                scribe_output = scribe_agent.generate_documentation(
-                    execution_record=execution_record,
-                    codebase_summary=discovery_result.codebase_summary,
+                # Phase 4: Generate documentation via scribe
+                console.print(
+                    f"[bold cyan]Step 5/5: Generating documentation for {pflow.name}...[/bold cyan]"
                 )
-                scribe_outputs.append(scribe_output)
-                console.print(f"[green]Documentation generated for {pflow.name}[/green]")
-            except Exception as exc:
-                logger.error("scribe_failed", flow=pflow.name, error=str(exc))
-                console.print(f"[red]Documentation generation failed for {pflow.name}: {exc}[/red]")
+                try:
+                    # Blocking Claude calls; keep them off the event loop
+                    scribe_output = await asyncio.to_thread(
+                        scribe_agent.generate_documentation,
+                        execution_record=execution_record,
+                        codebase_summary=codebase_summary,
+                    )
+                    scribe_outputs.append(scribe_output)
+                    console.print(f"[green]Documentation generated for {pflow.name}[/green]")
+                except Exception as exc:
+                    logger.error("scribe_failed", flow=pflow.name, error=str(exc))
+                    console.print(f"[red]Documentation generation failed for {pflow.name}: {exc}[/red]")
+        finally:
+            # Shut down the shared browser session now that all flows are done
+            await action_agent.close()
 
         return scribe_outputs
 
@@ -287,14 +323,11 @@ class DiscoveryAgent:
                 total=len(queries)
             )
 
-            for i, query in enumerate(queries, 1):
-                logger.debug("codebase_query", query_num=i, query=query[:60])
-
-                # Use REASONING query type for comprehensive answers
-                response = self.executor.run(query, QueryType.REASONING)
-                summaries.append(f"### Query {i}\n**Q:** {query}\n\n{response}\n")
+            # Use REASONING query type for comprehensive answers
+            responses = self._run_queries(queries, progress, task)
 
-                progress.update(task, advance=1)
+        for i, (query, response) in enumerate(zip(queries, responses), 1):
+            summaries.append(f"### Query {i}\n**Q:** {query}\n\n{response}\n")
 
         combined = "\n---\n\n".join(summaries)
         logger.info("codebase_explored", total_chars=len(combined), num_queries=len(queries))
@@ -336,20 +369,19 @@ class DiscoveryAgent:
                 total=len(followup_queries)
             )
 
-            for query in followup_queries:
-                logger.debug("refinement_query", query=query[:60])
+            # Query codebase for missing metadata; the lookups are independent,
+            # only the refinement below has to apply them one after another
+            contexts = self._run_queries(followup_queries, progress, task)
 
-                # Query codebase for missing metadata
-                additional_context = self.executor.run(query, QueryType.REASONING)
-                queries_used.append(query)
+        for query, additional_context in zip(followup_queries, contexts):
+            logger.debug("refinement_query", query=query[:60])
+            queries_used.append(query)
 
-                # Refine flows with new context
-                refined_flows = self.flow_agent.refine_with_additional_context(
-                    refined_flows,
-                    additional_context
-                )
-
-                progress.update(task, advance=1)
+            # Refine flows with new context
+            refined_flows = self.flow_agent.refine_with_additional_context(
+                refined_flows,
+                additional_context
+            )
 
         console.print(f"[green]Refined {len(queries_used)} metadata gaps[/green]")
         logger.info("refinement_completed", queries_used=len(queries_used))
@@ -364,6 +396,53 @@ class DiscoveryAgent:
             num_refinement_iterations=1
         )
 
+    def _run_queries(
+        self,
+        queries: List[str],
+        progress: Progress,
+        task,
+        max_workers: int = 5,
+    ) -> List[str]:
+        """
+        Run independent REASONING queries on a bounded worker pool.
+
+        Each query is dominated by its Claude round-trip, so they overlap well.
+        Queries are dispatched longest-first (query length as a cost proxy),
+        which keeps the total close to max(total / workers, longest query).
+
+        Args:
+            queries: Queries to run
+            progress: Progress display to advance as queries finish
+            task: Progress task id
+            max_workers: Maximum number of concurrent queries
+
+        Returns:
+            Responses in the same order as ``queries``
+        """
+        responses: List[str] = [""] * len(queries)
+        if not queries:
+            return responses
+
+        order = sorted(range(len(queries)), key=lambda i: len(queries[i]), reverse=True)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+            futures = {}
+            for i in order:
+                logger.debug("codebase_query", query_num=i + 1, query=queries[i][:60])
+                future = pool.submit(self.executor.run, queries[i], QueryType.REASONING)
+                futures[future] = i
+
+            try:
+                for future in as_completed(futures):
+                    responses[futures[future]] = future.result()
+                    progress.update(task, advance=1)
+            except BaseException:
+                # Fail fast like the sequential loop did: drop the queries that
+                # haven't started instead of waiting for them on pool exit
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        return responses
+
     def _extract_sources(self, codebase_summary: str) -> List[str]:
         """Extract file paths mentioned in codebase summary."""
         import re
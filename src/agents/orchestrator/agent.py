@@ -17,13 +17,13 @@ Error Handling:
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import anthropic
+import orjson
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
@@ -510,8 +510,12 @@ class OrchestratorAgent:
             else:
                 result_text = str(result)
             
-            # Check for errors in result
-            is_error = "error" in result_text.lower()[:200] or "failed" in result_text.lower()[:200]
+            # Check for errors in result. Only a clean task_executor report carries
+            # the success status line; its head echoes URLs and typed values, so
+            # searching it for "error"/"failed" misjudges runs
+            from src.agents.action.tools import ALL_STEPS_SUCCEEDED
+
+            is_error = ALL_STEPS_SUCCEEDED not in result_text
             
             duration = (datetime.now() - start_time).total_seconds()
             
@@ -810,16 +814,20 @@ Begin now."""
                         # Execute the tool
                         result = await self._execute_tool(block.name, block.input)
                         
-                        # Format result for Claude
+                        # Format result for Claude (orjson: agent outputs can be large)
                         if result.success:
-                            result_content = json.dumps(result.output, indent=2, default=str)
+                            result_content = orjson.dumps(
+                                result.output,
+                                default=str,
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                            ).decode()
                         else:
-                            result_content = json.dumps({
+                            result_content = orjson.dumps({
                                 "error": True,
                                 "error_message": result.error.message if result.error else "Unknown error",
                                 "error_type": result.error.error_type.value if result.error else "unknown",
                                 "recoverable": result.error.recoverable if result.error else False
-                            }, indent=2)
+                            }, option=orjson.OPT_INDENT_2).decode()
                         
                         tool_results.append({
                             "type": "tool_result",
@@ -7,10 +7,13 @@ import sys
 from pathlib import Path
 
 # Add project root to path
-sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(_PROJECT_ROOT))
 
 from dotenv import load_dotenv
-load_dotenv()
+# Explicit path: a bare load_dotenv() runs find_dotenv(), which stats its way
+# up the directory tree looking for the file
+load_dotenv(_PROJECT_ROOT / ".env")
 
 from src.agents.orchestrator import OrchestratorAgent, orchestrate
 
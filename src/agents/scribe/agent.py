@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 import base64
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import anthropic
 
@@ -21,6 +21,9 @@ from .prompts import (
 
 logger = get_logger(__name__)
 
+# Screenshot file suffix -> media type sent to the vision model
+_IMAGE_MEDIA_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
 
 class ScribeAgent:
     """
@@ -47,6 +50,8 @@ class ScribeAgent:
         self._client = anthropic.Anthropic(api_key=api_key or config.CLAUDE_API_KEY)
         self._model = "claude-sonnet-4-5"
         self._repo_path = Path(repo_path)
+        self._docs_dir = self._repo_path / ".deep-context-docs"
+        self._docs_dir_ready = False  # Created on first write, not on every flow
         self._accumulated_outputs: List[ScribeOutput] = []
         logger.info("ScribeAgent initialized with model: %s, repo: %s", self._model, self._repo_path)
 
@@ -119,6 +124,7 @@ class ScribeAgent:
         lines.append("")
         lines.append("### Executed Steps")
 
+        shots = self._steps_by_screenshot(record)
         for step in record.steps:
             lines.append(f"\n**Step {step.step_number}: {step.action.upper()}**")
             lines.append(f"- Target: {step.target_element}")
@@ -130,31 +136,55 @@ class ScribeAgent:
             if step.error:
                 lines.append(f"- ERROR: {step.error}")
             if step.screenshot_path:
-                lines.append(f"- Screenshot: {Path(step.screenshot_path).name}")
+                others = [
+                    str(other.step_number)
+                    for other in shots[step.screenshot_path]
+                    if other is not step
+                ]
+                note = ""
+                if others:
+                    label = "step" if len(others) == 1 else "steps"
+                    note = f" (shared with {label} {', '.join(others)})"
+                lines.append(f"- Screenshot: {Path(step.screenshot_path).name}{note}")
 
             # Include a trimmed accessibility snapshot for context
             if step.accessibility_snapshot:
-                snapshot_lines = step.accessibility_snapshot.strip().split("\n")
-                # Keep first 30 lines to avoid bloating the prompt
+                snapshot = step.accessibility_snapshot.strip()
+                # Keep first 30 lines to avoid bloating the prompt; only split
+                # off what is kept instead of the whole (often huge) snapshot
+                snapshot_lines = snapshot.split("\n", 30)
                 trimmed = snapshot_lines[:30]
                 if len(snapshot_lines) > 30:
-                    trimmed.append(f"... ({len(snapshot_lines) - 30} more lines)")
+                    total_lines = snapshot.count("\n") + 1
+                    trimmed.append(f"... ({total_lines - 30} more lines)")
                 lines.append("- Page snapshot (trimmed):")
                 for sl in trimmed:
                     lines.append(f"  {sl}")
 
         return "\n".join(lines)
 
+    def _steps_by_screenshot(
+        self, record: FlowExecutionRecord
+    ) -> Dict[str, List[StepRecord]]:
+        """Group steps by screenshot path, in execution order."""
+        groups: Dict[str, List[StepRecord]] = {}
+        for step in record.steps:
+            if step.screenshot_path:
+                groups.setdefault(step.screenshot_path, []).append(step)
+        return groups
+
     def _build_screenshot_list(self, record: FlowExecutionRecord) -> str:
         """Build a formatted list of screenshots with step context."""
         lines = []
-        for step in record.steps:
-            if step.screenshot_path:
-                name = Path(step.screenshot_path).name
-                lines.append(
-                    f"- `{name}` — Step {step.step_number}: "
-                    f"{step.action} {step.target_element}"
-                )
+        for path, steps in self._steps_by_screenshot(record).items():
+            name = Path(path).name
+            described = "; ".join(
+                f"Step {step.step_number}: {step.action} {step.target_element}"
+                for step in steps
+            )
+            if len(steps) > 1:
+                described += " (one capture covers all of these steps)"
+            lines.append(f"- `{name}` — {described}")
         return "\n".join(lines) if lines else "No screenshots captured."
 
     def _analyze_flow(
@@ -203,12 +233,15 @@ class ScribeAgent:
         for spath in screenshot_paths:
             image_data = self._load_screenshot(spath)
             if image_data:
+                media_type = _IMAGE_MEDIA_TYPES.get(
+                    Path(spath).suffix.lower(), "image/png"
+                )
                 content.append(
                     {
                         "type": "image",
                         "source": {
                             "type": "base64",
-                            "media_type": "image/png",
+                            "media_type": media_type,
                             "data": image_data,
                         },
                     }
@@ -237,10 +270,12 @@ class ScribeAgent:
     def _load_screenshot(self, path: str) -> Optional[str]:
         """Load a screenshot file and return base64-encoded data."""
         try:
-            filepath = Path(path)
-            if filepath.exists() and filepath.stat().st_size > 0:
-                with open(filepath, "rb") as f:
-                    return base64.b64encode(f.read()).decode("utf-8")
+            # Read directly instead of probing with exists()/stat() first
+            data = Path(path).read_bytes()
+            if data:
+                return base64.b64encode(data).decode("utf-8")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning("Could not load screenshot %s: %s", path, e)
         return None
@@ -258,9 +293,10 @@ class ScribeAgent:
             logger.warning("No documentation to write")
             return None
         
-        output_dir = self._repo_path / ".deep-context-docs"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = output_dir / "flows.md"
+        if not self._docs_dir_ready:
+            self._docs_dir.mkdir(parents=True, exist_ok=True)
+            self._docs_dir_ready = True
+        output_file = self._docs_dir / "flows.md"
         
         # Combine all documentation with separators
         combined = "\n\n---\n\n".join(
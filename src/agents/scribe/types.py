@@ -18,7 +18,9 @@ class StepRecord:
     match_type: str = "none"  # "exact", "fuzzy", "not_found"
     value: Optional[str] = None  # Value typed/selected
     accessibility_snapshot: str = ""  # Page state before action
-    screenshot_path: Optional[str] = None  # Screenshot after action
+    # Screenshot after action. Shared by several steps when one capture covers
+    # them: a run of consecutive auto-fills, or a final state that didn't change
+    screenshot_path: Optional[str] = None
     result: str = ""  # Success/failure message
     url: str = ""  # Current page URL
     error: Optional[str] = None  # Error message if step failed
@@ -45,7 +47,10 @@ class FlowExecutionRecord:
 
     @property
     def screenshot_paths(self) -> List[str]:
-        return [s.screenshot_path for s in self.steps if s.screenshot_path]
+        # Steps on an unchanged page may share a screenshot; list each file once
+        return list(
+            dict.fromkeys(s.screenshot_path for s in self.steps if s.screenshot_path)
+        )
 
 
 @dataclass
@@ -1,4 +1,5 @@
 """Structured logging using structlog + rich."""
+import functools
 import logging
 import sys
 import structlog
@@ -6,26 +7,28 @@ import structlog
 
 def setup_logging(level: str = "INFO") -> None:
     """Configure structlog with console-friendly output."""
+    log_level = getattr(logging, level.upper(), logging.INFO)
+    # structlog prints directly (PrintLoggerFactory); this only covers
+    # third-party libraries that log through the stdlib
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, level.upper(), logging.INFO),
+        level=log_level,
     )
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
-            structlog.processors.TimeStamper(fmt="%H:%M:%S", utc=False),
+            structlog.processors.TimeStamper(fmt="%H:%M:%SZ", utc=True),
             structlog.dev.ConsoleRenderer(colors=True),
         ],
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, level.upper(), logging.INFO)
-        ),
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
         logger_factory=structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str) -> structlog.BoundLogger:
     return structlog.get_logger(name)
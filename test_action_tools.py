@@ -0,0 +1,109 @@
+"""Tests for the snapshot readiness checks used by the dropdown select action."""
+
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from agents.action.tools import (
+    _TEXTBOX_ROLE_RE,
+    _dropdown_closed,
+    _dropdown_opened,
+    _refs_with_role,
+    _subform_closed,
+    _subform_opened,
+)
+
+# Client form with a nav list, before the "Contact" dropdown is opened
+FORM = """- navigation [ref=e1]:
+  - list [ref=e2]:
+    - listitem [ref=e3]: Dashboard
+    - listitem [ref=e4]: Clients
+- textbox "Client Name *" [ref=e5]
+- textbox "Website" [ref=e6]
+- combobox "Contact" [ref=e7]
+- button "Save Client" [ref=e8]
+"""
+
+# Same page with the focus moved; nothing new has rendered
+FORM_FOCUSED = FORM.replace('[ref=e5]', '[active] [ref=e5]')
+
+# Dropdown open, still empty
+FORM_EXPANDED = FORM.replace('"Contact" [ref=e7]', '"Contact" [expanded] [ref=e7]')
+
+# Dropdown open with its options rendered
+FORM_OPTIONS = FORM_EXPANDED + """- listbox [ref=e9]:
+  - option "Jane Doe" [ref=e10]
+  - option "John Roe" [ref=e11]
+"""
+
+# Form after clicking "Add Contact": a modal with its own fields
+FORM_SUBFORM = FORM + """- dialog "New Contact" [ref=e12]:
+  - textbox "Contact Name" [ref=e13]
+  - textbox "Email" [ref=e14]
+  - button "Create" [ref=e15]
+"""
+
+# Modal still rendering: only its first field is there yet
+FORM_SUBFORM_PARTIAL = FORM + """- dialog "New Contact" [ref=e12]:
+  - textbox "Contact Name" [ref=e13]
+"""
+
+# Modal fields filled in, save not finished yet
+FORM_SUBFORM_FILLED = (
+    FORM_SUBFORM
+    .replace('[ref=e13]', '[ref=e13]: TEST-HACK-Contact-Name')
+    .replace('[ref=e14]', '[ref=e14]: TEST-HACK-Email')
+)
+
+
+def test_dropdown_opened_ignores_existing_list_items():
+    ready = _dropdown_opened(FORM)
+    assert not ready(FORM)
+    assert not ready(FORM_EXPANDED)
+    assert ready(FORM_OPTIONS)
+
+
+def test_dropdown_opened_rejects_empty_snapshot():
+    assert not _dropdown_opened(FORM)("")
+
+
+def test_dropdown_closed_waits_for_options_and_expanded_state():
+    ready = _dropdown_closed("e7", FORM, FORM_OPTIONS)
+    assert not ready(FORM_OPTIONS)
+    assert not ready(FORM_EXPANDED)
+    assert ready(FORM)
+    assert not ready("")
+
+
+def test_subform_opened_needs_new_textboxes():
+    ready = _subform_opened(FORM)
+    assert not ready(FORM)
+    assert not ready(FORM_FOCUSED)
+    assert not ready(FORM_SUBFORM)  # First sighting; may still be rendering
+    assert ready(FORM_SUBFORM)
+
+
+def test_subform_opened_waits_for_fields_to_settle():
+    ready = _subform_opened(FORM)
+    assert not ready(FORM_SUBFORM_PARTIAL)
+    assert not ready(FORM_SUBFORM)  # Another field rendered since the last poll
+    assert ready(FORM_SUBFORM)
+
+
+def test_subform_closed_waits_for_subform_fields_to_go():
+    subform_refs = (
+        _refs_with_role(FORM_SUBFORM, _TEXTBOX_ROLE_RE)
+        - _refs_with_role(FORM, _TEXTBOX_ROLE_RE)
+    )
+    assert subform_refs == {"e13", "e14"}
+
+    ready = _subform_closed(subform_refs, "Contact")
+    assert not ready(FORM_SUBFORM_FILLED)
+    assert ready(FORM)
+
+
+def test_subform_closed_without_subform_never_ready():
+    # No sub-form fields were seen, so there is nothing to wait for: run out the timeout
+    assert not _subform_closed(frozenset(), "Contact")(FORM)